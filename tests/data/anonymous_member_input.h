@@ -0,0 +1,3 @@
+struct Outer {
+    struct { int x; } *inner;
+};
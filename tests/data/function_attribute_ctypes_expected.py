@@ -0,0 +1,11 @@
+from ctypes import c_int, cdll
+
+function_attribute = cdll.LoadLibrary("function_attribute.dll")
+
+# Exported functions are often marked with attributes like this
+set_value = function_attribute.set_value
+set_value.restype = None
+set_value.argtypes = [
+    c_int,
+]
+
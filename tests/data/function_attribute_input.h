@@ -0,0 +1,2 @@
+// Exported functions are often marked with attributes like this
+__attribute__((visibility("default"))) void set_value(int value);
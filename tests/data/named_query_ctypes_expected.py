@@ -0,0 +1,15 @@
+from ctypes import Structure, c_int
+
+
+class Node(Structure):
+    _fields_ = (
+        ("value", c_int),
+    )
+
+
+NodeType: type = Node
+
+__all__ = [
+    "Node",
+    "NodeType",
+]
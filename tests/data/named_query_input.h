@@ -0,0 +1,7 @@
+#include "named_query_other.h"
+
+struct Node {
+    int value;
+};
+
+typedef struct Node NodeType;
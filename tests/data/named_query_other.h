@@ -0,0 +1,3 @@
+struct Other {
+    int count;
+};
@@ -0,0 +1,19 @@
+from ctypes import POINTER, Structure, c_int
+
+
+class Second(Structure):
+    _fields_ = (
+        ("value", c_int),
+    )
+
+
+class First(Structure):
+    _fields_ = (
+        ("second", POINTER(Second)),
+    )
+
+
+__all__ = [
+    "First",
+    "Second",
+]
@@ -0,0 +1,23 @@
+from ctypes import POINTER, Structure
+
+
+# Forward declaration. Definition of _fields_ will appear later.
+class Node(Structure):
+    pass
+
+
+class Edge(Structure):
+    _fields_ = (
+        ("target", POINTER(Node)),
+    )
+
+
+Node._fields_ = (
+        ("first_edge", POINTER(Edge)),
+    )
+
+
+__all__ = [
+    "Edge",
+    "Node",
+]
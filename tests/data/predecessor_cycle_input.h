@@ -0,0 +1,10 @@
+struct Node {
+    struct Edge* first_edge;
+};
+
+struct Edge {
+    struct Node* target;
+};
+
+#define FIRST_VALUE 1
+#define SECOND_VALUE FIRST_VALUE
@@ -0,0 +1,7 @@
+struct First {
+    struct Second* second;
+};
+
+struct Second {
+    int value;
+};
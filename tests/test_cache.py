@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from clang.cindex import Index
+
+import wrapid
+
+
+class CacheTester(unittest.TestCase):
+    def test_cached_translation_unit(self):
+        file_path = "data/simple_macro_definition_input.h"
+        with open("data/simple_macro_definition_ctypes_expected.py") as f:
+            py_code_expected = f.read()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # First pass parses and saves the AST, second pass loads it
+            for parse_count in [1, 0]:
+                with mock.patch.object(Index, "parse", autospec=True, side_effect=Index.parse) as parse:
+                    mb = wrapid.ModuleBuilder(
+                        path=file_path,
+                        cache_dir=cache_dir,
+                    )
+                self.assertEqual(parse_count, parse.call_count)
+                mb.in_header(file_path).macros().include()
+                cg = wrapid.CTypesCodeGenerator(mb)
+                py_code_stream = io.StringIO()
+                cg.write_module(py_code_stream)
+                self.assertEqual(py_code_expected, py_code_stream.getvalue())
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+
+    def test_modified_include(self):
+        with tempfile.TemporaryDirectory() as source_dir, tempfile.TemporaryDirectory() as cache_dir:
+            file_path = os.path.join(source_dir, "outer.h")
+            include_path = os.path.join(source_dir, "inner.h")
+            with open(file_path, "w") as f:
+                f.write('#include "inner.h"\n')
+            with open(include_path, "w") as f:
+                f.write("#define INNER_VALUE 1\n")
+            wrapid.ModuleBuilder(path=file_path, cache_dir=cache_dir)
+            # Modify the included header after the AST was saved.
+            # Either libclang refuses to load the stale AST, or its include times reveal it.
+            with open(include_path, "w") as f:
+                f.write("#define INNER_VALUE 2\n")
+            (ast_name,) = os.listdir(cache_dir)
+            saved_time = os.path.getmtime(os.path.join(cache_dir, ast_name))
+            os.utime(include_path, (saved_time + 10, saved_time + 10))
+            with mock.patch.object(Index, "parse", autospec=True, side_effect=Index.parse) as parse:
+                mb = wrapid.ModuleBuilder(path=file_path, cache_dir=cache_dir)
+            self.assertEqual(1, parse.call_count)
+            macro = mb.in_header(include_path).macro("INNER_VALUE")
+            self.assertEqual("2", list(macro.get_tokens())[1].spelling)
+
+    def test_modified_file(self):
+        with tempfile.TemporaryDirectory() as source_dir, tempfile.TemporaryDirectory() as cache_dir:
+            file_path = os.path.join(source_dir, "value.h")
+            with open(file_path, "w") as f:
+                f.write("#define VALUE 1\n")
+            wrapid.ModuleBuilder(path=file_path, cache_dir=cache_dir)
+            (ast_name,) = os.listdir(cache_dir)
+            saved_time = os.path.getmtime(os.path.join(cache_dir, ast_name))
+            with open(file_path, "w") as f:
+                f.write("#define VALUE 2\n")
+            os.utime(file_path, (saved_time + 10, saved_time + 10))
+            with mock.patch.object(Index, "parse", autospec=True, side_effect=Index.parse) as parse:
+                mb = wrapid.ModuleBuilder(path=file_path, cache_dir=cache_dir)
+            self.assertEqual(1, parse.call_count)
+            self.assertEqual("2", list(mb.macro("VALUE").get_tokens())[1].spelling)
+            # The stale AST file is replaced, rather than accumulating another one
+            self.assertEqual([ast_name], os.listdir(cache_dir))
+
+    def test_unwritable_cache_dir(self):
+        file_path = "data/simple_macro_definition_input.h"
+        with tempfile.NamedTemporaryFile() as not_a_dir:
+            # A regular file cannot hold the cache, so parsing goes on without it
+            mb = wrapid.ModuleBuilder(path=file_path, cache_dir=os.path.join(not_a_dir.name, "cache"))
+        self.assertEqual("DCTSIZE", mb.macro("DCTSIZE").name)
+
+    def test_absolute_file_names(self):
+        # File names are absolute in cache mode, whether or not the cached AST is used
+        file_path = "data/anonymous_member_input.h"
+
+        def generate(path, cache_dir=None) -> str:
+            mb = wrapid.ModuleBuilder(path=path, cache_dir=cache_dir)
+            mb.struct("Outer").include()
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):  # include the warnings
+                wrapid.CTypesCodeGenerator(mb).write_module(output)
+            return output.getvalue()
+
+        expected = generate(os.path.abspath(file_path))
+        self.assertIn(os.path.abspath(file_path), expected)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.assertEqual(expected, generate(file_path, cache_dir))  # parsed and saved
+            self.assertEqual(expected, generate(file_path, cache_dir))  # loaded
+
+
+if __name__ == "__main__":
+    unittest.main()
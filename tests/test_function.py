@@ -0,0 +1,26 @@
+import io
+import unittest
+
+import wrapid
+
+
+class FunctionTester(unittest.TestCase):
+    def test_function_attribute_ctypes(self):
+        mb = wrapid.ModuleBuilder(
+            path="data/function_attribute_input.h",
+        )
+        mb.functions().include()
+        cg = wrapid.CTypesCodeGenerator(mb, library=("function_attribute", "function_attribute.dll"))
+        py_code_stream = io.StringIO()
+        cg.write_module(py_code_stream)
+        py_code = py_code_stream.getvalue()
+        with open("data/function_attribute_ctypes_expected.py") as f:
+            py_code_expected = f.read()
+        # Verify that the code is generated as expected
+        self.assertEqual(py_code_expected, py_code)
+        # The library does not exist, so just verify that the generated module compiles
+        compile(py_code, "function_attribute", "exec")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+from unittest import mock
+
+import wrapid
+
+
+class ModuleBuilderTester(unittest.TestCase):
+    def test_comment_index_error(self):
+        mb = wrapid.ModuleBuilder(
+            path="data/simple_struct_input.h",
+        )
+        # An AttributeError while indexing must not look like a missing comment_starts attribute
+        with mock.patch.object(wrapid.ModuleBuilder, "_comment_tables", side_effect=AttributeError("no file")):
+            with self.assertRaisesRegex(RuntimeError, "no file"):
+                _ = mb.comment_starts
+            with self.assertRaisesRegex(RuntimeError, "no file"):
+                _ = mb.comment_ends
+        self.assertEqual(dict(), mb.comment_starts)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import io
+import unittest
+
+import wrapid
+from tests.util import import_module_from_string
+
+
+class NamedQueryTester(unittest.TestCase):
+    def test_chained_named_query_ctypes(self):
+        file_path = "data/named_query_input.h"
+        mb = wrapid.ModuleBuilder(
+            path=file_path,
+        )
+        node = mb.in_header(file_path).struct("Node")
+        node.include()
+        self.assertIs(node, mb.included().struct("Node"))
+        mb.in_header(file_path).typedef("NodeType").include()
+        cg = wrapid.CTypesCodeGenerator(mb)
+        py_code_stream = io.StringIO()
+        cg.write_module(py_code_stream)
+        py_code = py_code_stream.getvalue()
+        with open("data/named_query_ctypes_expected.py") as f:
+            py_code_expected = f.read()
+        # Verify that the code is generated as expected
+        self.assertEqual(py_code_expected, py_code)
+        # Verify that the generated module loads and works correctly
+        named_query = import_module_from_string("named_query", py_code)
+        self.assertEqual(3, named_query.NodeType(3).value)  # noqa
+
+    def test_chained_named_query_misses(self):
+        mb = wrapid.ModuleBuilder(
+            path="data/named_query_input.h",
+        )
+        # Node is declared in the main header, not in the included one
+        with self.assertRaisesRegex(RuntimeError, "no matches"):
+            mb.in_header("data/named_query_other.h").struct("Node")
+        # Nothing has been included yet
+        with self.assertRaisesRegex(RuntimeError, "no matches"):
+            mb.included().typedef("NodeType")
+        # Declarations from the included header are found through their own file
+        self.assertEqual("Other", mb.in_header("data/named_query_other.h").struct("Other").name)
+
+
+if __name__ == "__main__":
+    unittest.main()
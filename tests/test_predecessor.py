@@ -0,0 +1,30 @@
+import io
+import unittest
+
+import wrapid
+from tests.util import import_module_from_string
+
+
+class PredecessorTester(unittest.TestCase):
+    def test_predecessor_ctypes(self):
+        mb = wrapid.ModuleBuilder(
+            path="data/predecessor_input.h",
+        )
+        mb.struct("Second").include(before=mb.struct("First"))
+        mb.struct("First").include()
+        cg = wrapid.CTypesCodeGenerator(mb)
+        py_code_stream = io.StringIO()
+        cg.write_module(py_code_stream)
+        py_code = py_code_stream.getvalue()
+        with open("data/predecessor_ctypes_expected.py") as f:
+            py_code_expected = f.read()
+        # Verify that the code is generated as expected
+        self.assertEqual(py_code_expected, py_code)
+        # Verify that the generated module loads and works correctly
+        predecessor = import_module_from_string("predecessor", py_code)
+        first = predecessor.First()
+        self.assertFalse(first.second)  # noqa
+
+
+if __name__ == "__main__":
+    unittest.main()
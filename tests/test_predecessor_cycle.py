@@ -0,0 +1,50 @@
+import contextlib
+import io
+import unittest
+
+import wrapid
+from tests.util import import_module_from_string
+
+
+class PredecessorCycleTester(unittest.TestCase):
+    def test_struct_cycle_ctypes(self):
+        mb = wrapid.ModuleBuilder(
+            path="data/predecessor_cycle_input.h",
+        )
+        mb.struct("Node").include(before=mb.struct("Edge"))
+        mb.struct("Edge").include(before=mb.struct("Node"))
+        cg = wrapid.CTypesCodeGenerator(mb)
+        py_code_stream = io.StringIO()
+        warning_stream = io.StringIO()
+        with contextlib.redirect_stdout(warning_stream):
+            cg.write_module(py_code_stream)
+        py_code = py_code_stream.getvalue()
+        with open("data/predecessor_cycle_ctypes_expected.py") as f:
+            py_code_expected = f.read()
+        # Verify that the code is generated as expected
+        self.assertEqual(py_code_expected, py_code)
+        # The forward declaration resolves the cycle, so there is nothing to warn about
+        self.assertEqual("", warning_stream.getvalue())
+        # Verify that the generated module loads and works correctly
+        predecessor_cycle = import_module_from_string("predecessor_cycle", py_code)
+        node = predecessor_cycle.Node()
+        self.assertFalse(node.first_edge)  # noqa
+
+    def test_macro_cycle_warning(self):
+        mb = wrapid.ModuleBuilder(
+            path="data/predecessor_cycle_input.h",
+        )
+        mb.macro("FIRST_VALUE").include(before=mb.macro("SECOND_VALUE"))
+        mb.macro("SECOND_VALUE").include(before=mb.macro("FIRST_VALUE"))
+        cg = wrapid.CTypesCodeGenerator(mb)
+        warning_stream = io.StringIO()
+        with contextlib.redirect_stdout(warning_stream):
+            cg.write_module(io.StringIO())
+        warning = warning_stream.getvalue()
+        self.assertIn("WARNING: FIRST_VALUE", warning)
+        self.assertIn("predecessor cycle", warning)
+        self.assertIn("Predecessors: [SECOND_VALUE]", warning)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,6 +24,29 @@ class StructTester(unittest.TestCase):
         my_struct = simple_struct.MyStructure(6, "q".encode())
         self.assertEqual(6, my_struct.number)  # noqa
 
+    def test_struct_field(self):
+        mb = wrapid.ModuleBuilder(
+            path="data/predecessor_input.h",
+        )
+        first = mb.struct("First")
+        second = mb.struct("Second")
+        value = second.field("value")
+        self.assertEqual("value", value.name)
+        self.assertIs(value, second.field("value"))
+        with self.assertRaisesRegex(ValueError, "no such field: 'missing'"):
+            second.field("missing")
+        # Forward declaration copies find the same field wrappers,
+        # whether they are made after the first field query...
+        second.include_forward(before=first)
+        (second_forward,) = first.predecessors
+        self.assertIsNot(second, second_forward)
+        self.assertIs(value, second_forward.field("value"))
+        self.assertIs(second._fields_by_name, second_forward._fields_by_name)  # noqa
+        # ...or before it
+        first.include_forward(before=second)
+        (first_forward,) = second.predecessors
+        self.assertIs(first.field("second"), first_forward.field("second"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,6 @@
 import inspect
+from collections import defaultdict
+from itertools import islice
 from typing import Union, Callable, Iterator
 
 from clang.cindex import Type as ClangType
@@ -17,6 +19,7 @@ from wrapid.decl import (
     OpaqueWrapper,
     StructUnionWrapper,
     StructDeclType,
+    emission_order,
 )
 
 ICursor = Union[Cursor, DeclWrapper]
@@ -64,9 +67,18 @@ class CTypesCodeGenerator(object):
     def __init__(self, module_builder: ModuleBuilder, library=None):
         self.module_builder = module_builder
         self.library = library
-        self.imports = dict()
+        self.imports = defaultdict(set)
         self.all_section_cursors = set()
         self.unexposed_dependencies = dict()
+        self._coder_for_cursor_kind = {
+            CursorKind.ENUM_DECL: self.enum_code,
+            CursorKind.FUNCTION_DECL: self.function_code,
+            CursorKind.MACRO_DEFINITION: self.macro_code,
+            OpaqueKind: self.opaque_code,
+            CursorKind.STRUCT_DECL: self.struct_code,
+            CursorKind.TYPEDEF_DECL: self.typedef_code,
+            CursorKind.UNION_DECL: self.union_code,
+        }
 
     def above_comment(self, cursor, spacer: Spacer) -> str:
         """
@@ -75,17 +87,11 @@ class CTypesCodeGenerator(object):
         :param spacer: number of spaces cursor is indented in the output
         :return: either the empty string, or a python comment string
         """
-        tu_ix = self.module_builder.comment_index.get(cursor.translation_unit, None)
-        if tu_ix is None:
-            return
         loc_start = cursor.extent.start
         if loc_start.file is None:
             return
-        file_ix = tu_ix.get(loc_start.file.name, None)
-        if file_ix is None:
-            return
         # Above comment must end on the line before the cursor begins.
-        line_ix = file_ix["end_line"].get(loc_start.line - 1, None)
+        line_ix = self.module_builder.comment_ends.get((loc_start.file.name, loc_start.line - 1), None)
         if line_ix is None:
             return
         assert len(line_ix) == 1
@@ -110,15 +116,7 @@ class CTypesCodeGenerator(object):
         yield from spacer.end_pad(0)
 
     def coder_for_cursor_kind(self, cursor_kind: CursorKind) -> Callable[[ICursor, Spacer], Iterator[str]]:
-        return {
-            CursorKind.ENUM_DECL: self.enum_code,
-            CursorKind.FUNCTION_DECL: self.function_code,
-            CursorKind.MACRO_DEFINITION: self.macro_code,
-            OpaqueKind: self.opaque_code,
-            CursorKind.STRUCT_DECL: self.struct_code,
-            CursorKind.TYPEDEF_DECL: self.typedef_code,
-            CursorKind.UNION_DECL: self.union_code,
-        }[cursor_kind]
+        return self._coder_for_cursor_kind[cursor_kind]
 
     def enum_code(self, decl: DeclWrapper, spacer: Spacer):
         assert decl.kind == CursorKind.ENUM_DECL
@@ -188,8 +186,7 @@ class CTypesCodeGenerator(object):
                 result_type = w_type_for_clang_type(c.type)
             elif c.kind == CursorKind.PARM_DECL:
                 parameters.append(c)
-            else:
-                assert False
+            # Other children, such as attributes, do not affect the ctypes signature
         yield i + f"{decl.alias}.restype = {result_type.alias}"
         if len(parameters) == 0:
             yield i + f"{decl.alias}.argtypes = []"
@@ -224,19 +221,12 @@ class CTypesCodeGenerator(object):
         :param non_comment_code: Non-comment portion of the generated code line
         :return: code lines with comment attached
         """
-        tu_ix = self.module_builder.comment_index.get(cursor.translation_unit, None)
-        if tu_ix is None:
-            yield non_comment_code
-            return  # No comments are indexed for this translation unit
         loc_end = cursor.extent.end
         if loc_end.file is None:
-            return
-        file_ix = tu_ix.get(loc_end.file.name, None)
-        if file_ix is None:
             yield non_comment_code
-            return  # No comments are indexed for this source file
+            return  # No source file, so no comments
         # Right comment must start on the same line as the cursor ends.
-        line_ix = file_ix["start_line"].get(loc_end.line, None)
+        line_ix = self.module_builder.comment_starts.get((loc_end.file.name, loc_end.line), None)
         if line_ix is None:
             yield non_comment_code
             return  # No comments begin on the same source line as this declaration
@@ -266,7 +256,9 @@ class CTypesCodeGenerator(object):
     def macro_code(self, cursor: Cursor, spacer: Spacer):
         assert cursor.kind == CursorKind.MACRO_DEFINITION
         macro_name = cursor.spelling
-        tokens = list(cursor.get_tokens())[1:]  # skip the first token, which is the macro name
+        # skip the first token, which is the macro name,
+        # and stop after three more, which is enough to reject long definitions
+        tokens = list(islice(cursor.get_tokens(), 1, 4))
         if len(tokens) < 1:
             return  # empty definition
         if len(tokens) > 2:
@@ -299,7 +291,7 @@ class CTypesCodeGenerator(object):
         """
         Track import statements needed for the python module we are creating
         """
-        self.imports.setdefault(import_module, set()).add(import_name)
+        self.imports[import_module].add(import_name)
 
     def struct_code(self, decl: StructUnionWrapper, spacer: Spacer):
         assert decl.kind == CursorKind.STRUCT_DECL
@@ -374,18 +366,16 @@ class CTypesCodeGenerator(object):
         assert decl.kind == CursorKind.UNION_DECL
         yield from self._struct_union_code(decl, spacer, "Union")
 
-    # Factor out generating one cursor's lines, to help with
-    # automated dependency/before generation
+    # Factor out generating one cursor's lines
     def _write_declaration(self, decl: DeclWrapper, spacer: Spacer) -> Iterator[str]:
-        for dep in decl.predecessors:
-            if dep is decl:
-                continue
-            # TODO: check if its already exported first
-            yield from self._write_declaration(dep, spacer)
         coder = self.coder_for_cursor_kind(decl.kind)
         yield from coder(decl, spacer)
 
     def write_module(self, file):
+        """
+        Generate the python module source code.
+        :param file: writable text stream that receives the whole module in a single write() call
+        """
         self.imports.clear()
         self.all_section_cursors.clear()
         self.unexposed_dependencies.clear()
@@ -399,36 +389,40 @@ class CTypesCodeGenerator(object):
             body_spacer.pad_to(0)
             body_lines.append(f'{self.library[0]} = cdll.LoadLibrary("{self.library[1]}")')
             body_spacer.end_pad(0)
-        for decl in self.module_builder.included():
+        # Predecessors are generated just before the first declaration that needs them
+        cycle_breaks = []
+        for decl in emission_order(self.module_builder.included(), cycle_breaks):
             for line in self._write_declaration(decl, body_spacer):
                 body_lines.append(line)
-        # Now start printing lines for real
+        # Now assemble the complete module text
         # import statements
         spacer = Spacer()
-        prev_line = None
-        for line in self.import_code(spacer):
-            print(line, file=file)
-            prev_line = line
+        lines = list(self.import_code(spacer))
         # main body of code
         # special case for boundary between imports and body
-        if prev_line == "" and body_lines[0] == "":
+        if len(lines) > 0 and lines[-1] == "" and body_lines[0] == "":
             del body_lines[0]
-        for line in body_lines:
-            print(line, file=file)
+        lines.extend(body_lines)
         # __all__ stanza
-        for index, line in enumerate(self.all_section_code(body_spacer)):
-            print(line, file=file)
+        lines.extend(self.all_section_code(body_spacer))
+        # Emit everything with a single write, so the file's buffer size does not matter
+        file.write("".join(f"{line}\n" for line in lines))
         file.flush()
         # Warn about unexposed dependencies
         for dependee, dependers in self.unexposed_dependencies.values():
             unexposed_kind = short_name_for_cursor_kind.get(dependee.kind, str(dependee.kind))
-            print(inspect.cleandoc(f"""
-                WARNING: {dependee.spelling} [{unexposed_kind}]
-                > execution error W1040: This declaration is unexposed, but there are other 
-                > declarations that refer to it. This could cause
-                > "NameError: name is not defined" run time error.
-                > Declarations: [{', '.join(sorted([c.spelling for c in dependers.values()]))}]
-            """))
+            print(unexposed_warning_template.format(
+                name=dependee.spelling,
+                kind=unexposed_kind,
+                refs=", ".join(sorted([c.spelling for c in dependers.values()])),
+            ))
+        # Warn about declarations generated before their predecessors
+        for decl, predecessors in cycle_breaks:
+            print(predecessor_cycle_warning_template.format(
+                name=decl.spelling,
+                kind=short_name_for_cursor_kind.get(decl.kind, str(decl.kind)),
+                refs=", ".join(p.spelling for p in predecessors),
+            ))
 
 
 def _py_comment_from_token(token: Token):
@@ -464,6 +458,22 @@ short_name_for_cursor_kind = {
     CursorKind.STRUCT_DECL: "struct",
 }
 
+unexposed_warning_template = (
+    "WARNING: {name} [{kind}]\n"
+    "> execution error W1040: This declaration is unexposed, but there are other\n"
+    "> declarations that refer to it. This could cause\n"
+    "> \"NameError: name is not defined\" run time error.\n"
+    "> Declarations: [{refs}]"
+)
+
+predecessor_cycle_warning_template = (
+    "WARNING: {name} [{kind}]\n"
+    "> This declaration is part of a predecessor cycle, so it was generated\n"
+    "> before some of its predecessors. This could cause\n"
+    "> \"NameError: name is not defined\" run time error.\n"
+    "> Predecessors: [{refs}]"
+)
+
 
 __all__ = [
     "CTypesCodeGenerator",
@@ -7,6 +7,8 @@ class WCTypesType(object):
     """
     Base class for ctypes mapping from declared types
     """
+    __slots__ = ("clang_type", "_alias")
+
     def __init__(self, clang_type: ClangType):
         self.clang_type = clang_type
         self._alias = None
@@ -41,9 +43,13 @@ class WCTypesType(object):
 
 
 class ConstantArrayType(WCTypesType):
+    __slots__ = ("parent_declaration", "_element_count", "_element_type")
+
     def __init__(self, clang_type: ClangType, parent_declaration: Cursor):
         super().__init__(clang_type)
         self.parent_declaration = parent_declaration
+        self._element_count = None
+        self._element_type = None
 
     @property
     def alias(self) -> str:
@@ -55,6 +61,11 @@ class ConstantArrayType(WCTypesType):
 
     @property
     def element_count(self):
+        if self._element_count is None:
+            self._element_count = self._find_element_count()
+        return self._element_count
+
+    def _find_element_count(self):
         declaration = self.clang_type.get_declaration()
         if declaration.kind == CursorKind.NO_DECL_FOUND:
             declaration = self.parent_declaration
@@ -75,7 +86,9 @@ class ConstantArrayType(WCTypesType):
 
     @property
     def element_type(self) -> WCTypesType:
-        return w_type_for_clang_type(self.clang_type.element_type)
+        if self._element_type is None:
+            self._element_type = w_type_for_clang_type(self.clang_type.element_type)
+        return self._element_type
 
     def imports(self) -> Iterator[tuple[str, str]]:  # noqa
         """module/item pairs required for this type"""
@@ -83,6 +96,13 @@ class ConstantArrayType(WCTypesType):
 
 
 class FunctionPointerType(WCTypesType):
+    __slots__ = ("_arg_types", "_result_type")
+
+    def __init__(self, clang_type: ClangType):
+        super().__init__(clang_type)
+        self._arg_types = None
+        self._result_type = None
+
     def dependencies(self):
         yield from []
 
@@ -98,14 +118,24 @@ class FunctionPointerType(WCTypesType):
 
     @property
     def arg_types(self):
-        return [w_type_for_clang_type(a) for a in self.clang_type.argument_types()]
+        if self._arg_types is None:
+            self._arg_types = [w_type_for_clang_type(a) for a in self.clang_type.argument_types()]
+        return self._arg_types
 
     @property
     def result_type(self):
-        return w_type_for_clang_type(self.clang_type.get_result())
+        if self._result_type is None:
+            self._result_type = w_type_for_clang_type(self.clang_type.get_result())
+        return self._result_type
 
 
 class PointerType(WCTypesType):
+    __slots__ = ("_pointee",)
+
+    def __init__(self, clang_type: ClangType):
+        super().__init__(clang_type)
+        self._pointee = None
+
     def imports(self):
         yield "ctypes", "POINTER"
         yield from self.pointee.imports()
@@ -122,10 +152,14 @@ class PointerType(WCTypesType):
 
     @property
     def pointee(self) -> WCTypesType:
-        return w_type_for_clang_type(self.clang_type.get_pointee())
+        if self._pointee is None:
+            self._pointee = w_type_for_clang_type(self.clang_type.get_pointee())
+        return self._pointee
 
 
 class PrimitiveCTypesType(WCTypesType):
+    __slots__ = ("symbol",)
+
     def __init__(self, clang_type, symbol: str):
         super().__init__(clang_type)
         self.symbol = symbol
@@ -139,62 +173,105 @@ class PrimitiveCTypesType(WCTypesType):
 
 
 class VoidType(WCTypesType):
+    __slots__ = ()
+
     @property
     def alias(self) -> str:
         return "None"
 
 
 def w_type_for_clang_type(clang_type: ClangType, parent_declaration: Cursor = None) -> WCTypesType:
-    if clang_type.kind in primitive_ctype_for_clang_type:
-        return PrimitiveCTypesType(clang_type, primitive_ctype_for_clang_type[clang_type.kind])
-    elif clang_type.kind == TypeKind.CONSTANTARRAY:
-        return ConstantArrayType(clang_type, parent_declaration)
-    elif clang_type.kind == TypeKind.ELABORATED:
-        return w_type_for_clang_type(clang_type.get_declaration().type)
-    elif clang_type.kind == TypeKind.FUNCTIONPROTO:
-        return FunctionPointerType(clang_type)
-    elif clang_type.kind == TypeKind.POINTER:
-        pointee = clang_type.get_pointee()
-        if pointee.kind in [TypeKind.CHAR_S, TypeKind.SCHAR]:
-            return PrimitiveCTypesType(clang_type, "c_char_p")
-        elif pointee.kind == TypeKind.FUNCTIONPROTO:
-            return FunctionPointerType(pointee)
-        elif pointee.kind == TypeKind.VOID:
-            return PrimitiveCTypesType(clang_type, "c_void_p")
-        elif pointee.kind == TypeKind.WCHAR:
-            return PrimitiveCTypesType(clang_type, "c_wchar_p")
-        else:
-            return PointerType(clang_type)
-    elif clang_type.kind == TypeKind.TYPEDEF:
-        if clang_type.spelling == "size_t":
-            return PrimitiveCTypesType(clang_type, "c_size_t")
-        else:
-            return WCTypesType(clang_type)
-    elif clang_type.kind == TypeKind.VOID:
-        return VoidType(clang_type)
+    kind_value = clang_type.kind.value
+    symbol = primitive_ctype_table[kind_value] if kind_value < len(primitive_ctype_table) else None
+    if symbol is not None:
+        return PrimitiveCTypesType(clang_type, symbol)
+    builder = w_type_builder_for_clang_type.get(kind_value)
+    if builder is not None:
+        return builder(clang_type, parent_declaration)
     return WCTypesType(clang_type)
 
 
+def _constant_array_w_type(clang_type: ClangType, parent_declaration: Cursor) -> WCTypesType:
+    return ConstantArrayType(clang_type, parent_declaration)
+
+
+def _elaborated_w_type(clang_type: ClangType, _parent_declaration: Cursor) -> WCTypesType:
+    return w_type_for_clang_type(clang_type.get_declaration().type)
+
+
+def _function_proto_w_type(clang_type: ClangType, _parent_declaration: Cursor) -> WCTypesType:
+    return FunctionPointerType(clang_type)
+
+
+def _pointer_w_type(clang_type: ClangType, _parent_declaration: Cursor) -> WCTypesType:
+    pointee = clang_type.get_pointee()
+    if pointee.kind in char_pointee_kinds:
+        return PrimitiveCTypesType(clang_type, "c_char_p")
+    elif pointee.kind == TypeKind.FUNCTIONPROTO:
+        return FunctionPointerType(pointee)
+    elif pointee.kind == TypeKind.VOID:
+        return PrimitiveCTypesType(clang_type, "c_void_p")
+    elif pointee.kind == TypeKind.WCHAR:
+        return PrimitiveCTypesType(clang_type, "c_wchar_p")
+    else:
+        return PointerType(clang_type)
+
+
+def _typedef_w_type(clang_type: ClangType, _parent_declaration: Cursor) -> WCTypesType:
+    if clang_type.spelling == "size_t":
+        return PrimitiveCTypesType(clang_type, "c_size_t")
+    else:
+        return WCTypesType(clang_type)
+
+
+def _void_w_type(clang_type: ClangType, _parent_declaration: Cursor) -> WCTypesType:
+    return VoidType(clang_type)
+
+
+# Non-primitive type wrapper factories, keyed by integer TypeKind value
+w_type_builder_for_clang_type = {
+    TypeKind.CONSTANTARRAY.value: _constant_array_w_type,
+    TypeKind.ELABORATED.value: _elaborated_w_type,
+    TypeKind.FUNCTIONPROTO.value: _function_proto_w_type,
+    TypeKind.POINTER.value: _pointer_w_type,
+    TypeKind.TYPEDEF.value: _typedef_w_type,
+    TypeKind.VOID.value: _void_w_type,
+}
+
+
+# keyed by integer TypeKind value
 primitive_ctype_for_clang_type = {
-    TypeKind.BOOL: "c_bool",
-    TypeKind.CHAR_S: "c_char",
-    TypeKind.CHAR_U: "c_ubyte",
-    TypeKind.DOUBLE: "c_double",
-    TypeKind.FLOAT: "c_float",
-    TypeKind.INT: "c_int",
-    TypeKind.LONG: "c_long",
-    TypeKind.LONGDOUBLE: "c_longdouble",
-    TypeKind.LONGLONG: "c_longlong",
-    TypeKind.SCHAR: "c_char",
-    TypeKind.SHORT: "c_short",
-    TypeKind.UCHAR: "c_ubyte",
-    TypeKind.UINT: "c_uint",
-    TypeKind.ULONG: "c_ulong",
-    TypeKind.ULONGLONG: "c_ulonglong",
-    TypeKind.USHORT: "c_ushort",
-    TypeKind.WCHAR: "c_wchar",
+    TypeKind.BOOL.value: "c_bool",
+    TypeKind.CHAR_S.value: "c_char",
+    TypeKind.CHAR_U.value: "c_ubyte",
+    TypeKind.DOUBLE.value: "c_double",
+    TypeKind.FLOAT.value: "c_float",
+    TypeKind.INT.value: "c_int",
+    TypeKind.LONG.value: "c_long",
+    TypeKind.LONGDOUBLE.value: "c_longdouble",
+    TypeKind.LONGLONG.value: "c_longlong",
+    TypeKind.SCHAR.value: "c_char",
+    TypeKind.SHORT.value: "c_short",
+    TypeKind.UCHAR.value: "c_ubyte",
+    TypeKind.UINT.value: "c_uint",
+    TypeKind.ULONG.value: "c_ulong",
+    TypeKind.ULONGLONG.value: "c_ulonglong",
+    TypeKind.USHORT.value: "c_ushort",
+    TypeKind.WCHAR.value: "c_wchar",
 }
 
+# primitive_ctype_for_clang_type as a flat sequence indexed by TypeKind value
+primitive_ctype_table = tuple(
+    primitive_ctype_for_clang_type.get(kind_value)
+    for kind_value in range(max(primitive_ctype_for_clang_type) + 1)
+)
+
+# Pointers to these kinds are exposed as c_char_p
+char_pointee_kinds = frozenset([
+    TypeKind.CHAR_S,
+    TypeKind.SCHAR,
+])
+
 if __name__ == "__main__":
     # TODO:
     pass
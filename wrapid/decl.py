@@ -1,39 +1,37 @@
 import copy
 import enum
+import functools
+import heapq
+import os
 from collections import deque
-from collections.abc import Iterable, Callable
-from typing import Iterator, Optional
+from collections.abc import Iterable, Iterator, Callable
+from typing import Optional, Union
 
-from clang.cindex import CursorKind, Cursor, TranslationUnit, TypeKind
+from clang.cindex import CursorKind, Cursor, SourceLocation, TranslationUnit, TypeKind
 
 
 class WrappedDeclIndex(object):
     def __init__(self):
         self._index: dict[int, DeclWrapper] = dict()
 
-    def __contains__(self, cursor: Cursor) -> bool:
+    def __contains__(self, cursor: Union[Cursor, "DeclWrapper"]) -> bool:
         return self._cursor_key(cursor) in self._index
 
     @staticmethod
-    def _cursor_key(cursor: Cursor):
+    def _cursor_key(cursor: Union[Cursor, "DeclWrapper"]):
         # TODO: cursor.hash is not a perfect key because collisions
+        if isinstance(cursor, DeclWrapper):
+            return cursor._hash  # avoid another libclang call
         return cursor.hash
 
-    def get(self, cursor: Cursor) -> "DeclWrapper":
-        if cursor.kind == CursorKind.FIELD_DECL:
-            return self._index.setdefault(self._cursor_key(cursor), FieldWrapper(cursor, self))
-        elif cursor.kind == CursorKind.FUNCTION_DECL:
-            return self._index.setdefault(self._cursor_key(cursor), FunctionWrapper(cursor, self))
-        elif cursor.kind == CursorKind.PARM_DECL:
-            return self._index.setdefault(self._cursor_key(cursor), ParameterWrapper(cursor, self))
-        elif cursor.kind == CursorKind.STRUCT_DECL:
-            return self._index.setdefault(self._cursor_key(cursor), StructUnionWrapper(cursor, self))
-        elif cursor.kind == CursorKind.TYPEDEF_DECL:
-            return self._index.setdefault(self._cursor_key(cursor), TypedefWrapper(cursor, self))
-        elif cursor.kind == CursorKind.UNION_DECL:
-            return self._index.setdefault(self._cursor_key(cursor), StructUnionWrapper(cursor, self))
-        else:
-            return self._index.setdefault(self._cursor_key(cursor), DeclWrapper(cursor, self))
+    def get(self, cursor: Union[Cursor, "DeclWrapper"]) -> "DeclWrapper":
+        key = self._cursor_key(cursor)
+        wrapper = self._index.get(key)
+        if wrapper is None:
+            wrapper_class = wrapper_class_for_cursor_kind.get(cursor.kind, DeclWrapper)
+            wrapper = wrapper_class(cursor, self)
+            self._index[key] = wrapper
+        return wrapper
 
 
 class DeclWrapper(object):
@@ -42,9 +40,27 @@ class DeclWrapper(object):
 
     This class contains configuration that could be applied to all declarations.
     """
+    __slots__ = (
+        "_cursor",
+        "_index",
+        "_hash",
+        "_kind",
+        "_location",
+        "_spelling",
+        "_alias",
+        "predecessors",
+        "_exported",
+        "_included",
+    )
+
     def __init__(self, cursor: Cursor, index: WrappedDeclIndex) -> None:
         self._cursor: Cursor = cursor
         self._index: WrappedDeclIndex = index
+        self._hash: int = cursor.hash
+        # Frequently used cursor attributes, fetched from libclang on first use
+        self._kind: Optional[CursorKind] = None
+        self._location: Optional[SourceLocation] = None
+        self._spelling: Optional[str] = None
         self._alias: Optional[str] = None  # exported name
         # Declarations that must be generated before this one
         self.predecessors: set[DeclWrapper] = set()
@@ -62,7 +78,35 @@ class DeclWrapper(object):
         return getattr(self._cursor, method_name)
 
     def __hash__(self) -> int:
-        return self._cursor.hash
+        return self._hash
+
+    @property
+    def hash(self) -> int:
+        return self._hash
+
+    @property
+    def kind(self) -> CursorKind:
+        if self._kind is None:
+            self._kind = self._cursor.kind
+        return self._kind
+
+    @property
+    def location(self) -> SourceLocation:
+        if self._location is None:
+            self._location = self._cursor.location
+        return self._location
+
+    @property
+    def spelling(self) -> str:
+        if self._spelling is None:
+            self._spelling = self._cursor.spelling
+        return self._spelling
+
+    def get_children(self) -> Iterator[Cursor]:
+        return self._cursor.get_children()
+
+    def is_definition(self) -> bool:
+        return self._cursor.is_definition()
 
     def add_predecessor(self, predecessor: "DeclWrapper") -> None:
         self.predecessors.add(predecessor)
@@ -99,11 +143,11 @@ class DeclWrapper(object):
     def name(self) -> str:
         """The imported C/C++ name of the declaration"""
         # TODO: maybe eliminate name_for_cursor() function
-        if self.kind == CursorKind.STRUCT_DECL:
+        spelling = self.spelling
+        if not spelling and self.kind is CursorKind.STRUCT_DECL:
             # Workaround for anonymous structs
-            if len(self.spelling) < 1:
-                return self.type.spelling
-        return self.spelling
+            return self.type.spelling
+        return spelling
 
     def rename(self, name: str):
         self._alias = name
@@ -119,7 +163,128 @@ def everything_predicate(_cursor: DeclWrapper) -> bool:
     return True
 
 
+def _kind_predicate(kind: CursorKind, predicate: Predicate, definitions_only: bool = False) -> Predicate:
+    """
+    Filter for declarations of one kind that also satisfy a predicate.
+    :param definitions_only: Whether to also reject declarations that are not definitions
+    """
+    # CursorKind instances are singletons, so compare them by identity.
+    # The default predicate accepts everything, so leave out the call to it.
+    if predicate is everything_predicate:
+        if definitions_only:
+            return lambda c: c.kind is kind and c.is_definition()
+        return lambda c: c.kind is kind
+    if definitions_only:
+        return lambda c: c.kind is kind and predicate(c) and c.is_definition()
+    return lambda c: c.kind is kind and predicate(c)
+
+
+def _has_kind_and_spelling(kind: CursorKind, spelling: str, decl: DeclWrapper) -> bool:
+    return decl.kind is kind and decl.spelling == spelling
+
+
+def emission_order(
+        declarations: Iterable[DeclWrapper],
+        cycle_breaks: Optional[list[tuple[DeclWrapper, list[DeclWrapper]]]] = None,
+) -> list[DeclWrapper]:
+    """
+    Sort declarations so that each one follows its predecessors.
+
+    Declarations keep their original order where possible, and each predecessor
+    is placed just before the first declaration that needs it.
+    A predecessor cycle is broken with a forward declaration of a struct or union in the cycle.
+    Otherwise one declaration in the cycle is placed before some of its predecessors.
+    :param declarations: Declarations in their preferred order
+    :param cycle_breaks: Optional list that receives each declaration placed before some of its
+        predecessors, together with those predecessors
+    :return: The declarations, plus all their predecessors, each exactly once.
+        Forward declared structs and unions appear twice, as a forward declaration and a definition.
+    """
+    # Rank each declaration by the earliest original declaration that leads to it,
+    # then by discovery order.
+    rank: dict[DeclWrapper, tuple[int, int]] = dict()
+    successors: dict[DeclWrapper, list[DeclWrapper]] = dict()
+    in_degree: dict[DeclWrapper, int] = dict()
+    for position, root in enumerate(declarations):
+        if root in rank:
+            continue  # already found as a predecessor of an earlier declaration
+        rank[root] = (position, len(rank))
+        unexplored = deque([root])
+        while len(unexplored) > 0:
+            decl = unexplored.popleft()
+            in_degree[decl] = 0
+            for predecessor in decl.predecessors:
+                if predecessor is decl:
+                    continue
+                in_degree[decl] += 1
+                successors.setdefault(predecessor, list()).append(decl)
+                if predecessor not in rank:
+                    rank[predecessor] = (position, len(rank))
+                    unexplored.append(predecessor)
+    # Kahn's algorithm, always emitting the best ranked ready declaration
+    ready = [(rank[d], d) for d, count in in_degree.items() if count == 0]
+    heapq.heapify(ready)
+    released: set[DeclWrapper] = set()  # declarations their successors no longer wait for
+    definitions: dict[DeclWrapper, DeclWrapper] = dict()  # to replace forward declared structs
+    result = []
+    emitted_count = 0
+
+    def release(decl: DeclWrapper) -> None:
+        released.add(decl)
+        for successor in successors.get(decl, []):
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                heapq.heappush(ready, (rank[successor], successor))
+
+    while emitted_count < len(rank):
+        if len(ready) == 0:
+            stuck = min((d for d, count in in_degree.items() if count > 0), key=rank.get)
+            cycle = _predecessor_cycle(stuck, released, rank)
+            forwardable = [
+                d for d in cycle
+                if isinstance(d, StructUnionWrapper) and d.decl_type == StructDeclType.FULL
+            ]
+            if len(forwardable) > 0:
+                # Declare the class now, and define its fields after its predecessors
+                stuck = min(forwardable, key=rank.get)
+                forward_decl, definitions[stuck] = stuck.split_forward()
+                result.append(forward_decl)
+                release(stuck)
+                continue
+            # Nothing to forward declare, so emit the best ranked declaration early
+            stuck = min(cycle, key=rank.get)
+            if cycle_breaks is not None:
+                waiting = [p for p in stuck.predecessors if p is not stuck and p not in released]
+                cycle_breaks.append((stuck, sorted(waiting, key=rank.get)))
+            in_degree[stuck] = 0
+            heapq.heappush(ready, (rank[stuck], stuck))
+        _, decl = heapq.heappop(ready)
+        result.append(definitions.get(decl, decl))
+        emitted_count += 1
+        if decl not in released:
+            release(decl)
+    return result
+
+
+def _predecessor_cycle(
+        decl: DeclWrapper,
+        released: set[DeclWrapper],
+        rank: dict[DeclWrapper, tuple[int, int]],
+) -> list[DeclWrapper]:
+    """Find a cycle of unreleased predecessors, upstream of a declaration that is still waiting"""
+    path = []
+    position: dict[DeclWrapper, int] = dict()
+    while decl not in position:
+        position[decl] = len(path)
+        path.append(decl)
+        # Every waiting declaration has at least one unreleased predecessor
+        decl = min((p for p in decl.predecessors if p is not decl and p not in released), key=rank.get)
+    return path[position[decl]:]
+
+
 class FieldWrapper(DeclWrapper):
+    __slots__ = ()
+
     def field_type(self) -> DeclWrapper:
         clang_type = self.type
         if clang_type.kind == TypeKind.POINTER:
@@ -131,9 +296,11 @@ class FieldWrapper(DeclWrapper):
 
 
 class FunctionWrapper(DeclWrapper):
+    __slots__ = ()
+
     def parameters(self) -> Iterator["ParameterWrapper"]:
         for child in self.get_children():
-            if child.kind == CursorKind.PARM_DECL:
+            if child.kind is CursorKind.PARM_DECL:
                 yield self._index.get(child)
 
 
@@ -141,12 +308,16 @@ OpaqueKind = -1234
 
 
 class OpaqueWrapper(DeclWrapper):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.kind = OpaqueKind
+        self._kind = OpaqueKind
 
 
 class ParameterWrapper(DeclWrapper):
+    __slots__ = ()
+
     def type_decl(self) -> DeclWrapper:
         return self._index.get(self.type.get_declaration())
 
@@ -159,29 +330,55 @@ class TranslationUnitIterable(object):
     def __init__(self, translation_unit: TranslationUnit, wrapper_index: WrappedDeclIndex) -> None:
         self.parent_cursor: Cursor = translation_unit.cursor
         self.wrapper_index = wrapper_index
+        # Each of these is computed once, on first use, to avoid repeated traversals in libclang
+        self._children: Optional[list[Cursor]] = None  # top level cursors
+        self._by_name: Optional[dict[tuple[CursorKind, str], list[Cursor]]] = None  # top level cursors by name
+        self._declarations: Optional[list[DeclWrapper]] = None  # wrapped cursors in iteration order
+
+    def declarations_named(self, kind: CursorKind, spelling: str) -> list[DeclWrapper]:
+        """Declarations of a particular kind with a particular spelling"""
+        if self._by_name is None:
+            # Index the raw cursors, so that only the queried declarations get wrapped
+            self._by_name = dict()
+            for cursor in self._top_level_cursors():
+                self._by_name.setdefault((cursor.kind, cursor.spelling), list()).append(cursor)
+        return [self.wrapper_index.get(c) for c in self._by_name.get((kind, spelling), [])]
 
     def __iter__(self) -> Iterator[DeclWrapper]:
+        if self._declarations is None:
+            self._declarations = list(self._realigned_declarations())
+        return iter(self._declarations)
+
+    def _top_level_cursors(self) -> list[Cursor]:
+        if self._children is None:
+            self._children = list(self.parent_cursor.get_children())
+        return self._children
+
+    def _realigned_declarations(self) -> Iterator[DeclWrapper]:
         # all the macro definitions arrive at once, before everything else.
         # so reserve the ones for the current file until the other stuff has arrived.
         # TODO: also distribute comments here or in __init__
         # TODO: also do something clever with MACRO_INSTANTIATIONs
-        macro_deque = deque()
-        for cursor in self.parent_cursor.get_children():
+        macro_deque = deque()  # (line, cursor) pairs
+        parent_file = self.parent_cursor.spelling
+        for cursor in self._top_level_cursors():
             # For now, just realign the declarations in the main source file
-            if str(cursor.location.file) == self.parent_cursor.spelling:
-                if cursor.kind == CursorKind.MACRO_INSTANTIATION:
+            file = cursor.location.file
+            if file is not None and file.name == parent_file:
+                if cursor.kind is CursorKind.MACRO_INSTANTIATION:
                     pass  # Let these also-early declarations go through for now, because laziness
-                elif cursor.kind == CursorKind.MACRO_DEFINITION:
-                    macro_deque.append(cursor)  # postpone traversal of these macros
+                elif cursor.kind is CursorKind.MACRO_DEFINITION:
+                    macro_deque.append((cursor.location.line, cursor))  # postpone traversal of these macros
                     continue
                 else:
                     # Drain macros that occur before this cursor in the file
-                    while len(macro_deque) > 0 and macro_deque[0].location.line <= cursor.extent.end.line:
-                        yield self.wrapper_index.get(macro_deque.popleft())
+                    end_line = cursor.extent.end.line
+                    while len(macro_deque) > 0 and macro_deque[0][0] <= end_line:
+                        yield self.wrapper_index.get(macro_deque.popleft()[1])
             yield self.wrapper_index.get(cursor)
         # Drain remaining macros
         while len(macro_deque) > 0:
-            yield self.wrapper_index.get(macro_deque.popleft())
+            yield self.wrapper_index.get(macro_deque.popleft()[1])
 
 
 class StructDeclType(enum.Enum):
@@ -191,22 +388,47 @@ class StructDeclType(enum.Enum):
 
 
 class StructUnionWrapper(DeclWrapper):
+    __slots__ = ("decl_type", "_fields_by_name")
+
     def __init__(self, *args, decl_type: StructDeclType = StructDeclType.FULL, **kwargs):
         super().__init__(*args, **kwargs)
         self.decl_type = decl_type
+        self._fields_by_name: Optional[dict[str, Cursor]] = None  # populated by the first field query
+
+    def __copy__(self):
+        copied = super().__copy__()
+        copied._fields_by_name = self._fields_by_name  # copies have the same fields
+        return copied
 
     def field(self, field_name) -> DeclWrapper:
-        for field in self.fields():
-            if field.name == field_name:
-                return field
-                # TODO: error on multiple hits
-        raise ValueError(f"no such field: '{field_name}'")  # TODO: better message
+        if self._fields_by_name is None:
+            self._fields_by_name = dict()
+            for child in self.get_children():
+                if child.kind is CursorKind.FIELD_DECL:
+                    # TODO: error on multiple hits
+                    self._fields_by_name.setdefault(child.spelling, child)
+        cursor = self._fields_by_name.get(field_name)
+        if cursor is None:
+            raise ValueError(f"no such field: '{field_name}'")  # TODO: better message
+        return self._index.get(cursor)
 
     def fields(self) -> Iterator[FieldWrapper]:
         for child in self.get_children():
-            if child.kind == CursorKind.FIELD_DECL:
+            if child.kind is CursorKind.FIELD_DECL:
                 yield self._index.get(child)
 
+    def split_forward(self) -> tuple["StructUnionWrapper", "StructUnionWrapper"]:
+        """
+        Separate copies of this declaration for a forward declaration and a later definition.
+        :return: (forward declaration, definition) pair
+        """
+        forward_decl = copy.copy(self)
+        forward_decl.decl_type = StructDeclType.FORWARD_ONLY
+        definition = copy.copy(self)
+        definition.decl_type = StructDeclType.DEFINITION_ONLY
+        definition._exported = self._exported
+        return forward_decl, definition
+
     def include_forward(self, before: DeclWrapper, export: bool = False) -> None:
         forward_decl = copy.copy(self)
         forward_decl.decl_type = StructDeclType.FORWARD_ONLY
@@ -216,6 +438,8 @@ class StructUnionWrapper(DeclWrapper):
 
 
 class TypedefWrapper(DeclWrapper):
+    __slots__ = ()
+
     def base_type(self):
         clang_type = self.underlying_typedef_type
         if clang_type.kind == TypeKind.POINTER:
@@ -224,6 +448,16 @@ class TypedefWrapper(DeclWrapper):
         return self._index.get(cursor)
 
 
+wrapper_class_for_cursor_kind = {
+    CursorKind.FIELD_DECL: FieldWrapper,
+    CursorKind.FUNCTION_DECL: FunctionWrapper,
+    CursorKind.PARM_DECL: ParameterWrapper,
+    CursorKind.STRUCT_DECL: StructUnionWrapper,
+    CursorKind.TYPEDEF_DECL: TypedefWrapper,
+    CursorKind.UNION_DECL: StructUnionWrapper,
+}
+
+
 class BaseDeclGroup(Iterable[DeclWrapper]):
     """
     Base class for declaration generators.
@@ -237,17 +471,16 @@ class BaseDeclGroup(Iterable[DeclWrapper]):
             wrapper_index: WrappedDeclIndex,
             predicate: Predicate = everything_predicate,
     ) -> None:
-        iter(cursors)  # No exception? it's OK we want an iterABLE
-        try:
-            next(cursors)
-            assert False  # but we don't want an iteratOR
-        except TypeError:
-            pass  # OK, not an iteratOR
+        # We want an iterABLE, but not an iteratOR, which could only be traversed once
+        assert isinstance(cursors, Iterable) and not isinstance(cursors, Iterator)
         self._cursors: Iterable[DeclWrapper] = cursors
         self._wrapper_index: WrappedDeclIndex = wrapper_index
         self._predicate: Predicate = predicate
 
     def __iter__(self) -> Iterator[DeclWrapper]:
+        if self._predicate is everything_predicate:
+            yield from self._cursors  # no need to call the default predicate on each one
+            return
         for cursor in self._cursors:
             if not self._predicate(cursor):
                 continue
@@ -259,10 +492,24 @@ class BaseDeclGroup(Iterable[DeclWrapper]):
         :param path: The path to a source code file
         :return: An iterable over the declarations in this group found in a particular source file
         """
+        # Compare absolute paths, because file names are absolute in ASTs loaded from a cache
+        target = os.path.abspath(str(path))
+        matches_by_file_name: dict[str, bool] = dict()  # to call abspath only once per file
+
+        def in_target(c: DeclWrapper) -> bool:
+            file = c.location.file
+            if file is None:
+                return False
+            file_name = file.name
+            match = matches_by_file_name.get(file_name)
+            if match is None:
+                match = matches_by_file_name[file_name] = os.path.abspath(file_name) == target
+            return match
+
         return type(self)(
             cursors=self,
             wrapper_index=self._wrapper_index,
-            predicate=lambda c: str(c.location.file) == str(path),
+            predicate=in_target,
         )
 
     def included(self, predicate: Predicate = everything_predicate) -> Iterable[DeclWrapper]:
@@ -270,9 +517,7 @@ class BaseDeclGroup(Iterable[DeclWrapper]):
         return type(self)(
             self,
             self._wrapper_index,
-            lambda c:
-                c in self._wrapper_index
-                and self._wrapper_index.get(c).is_included(),
+            lambda c: c.is_included(),  # the declarations are already wrapped
         )
 
     def include(self) -> None:
@@ -283,17 +528,42 @@ class BaseDeclGroup(Iterable[DeclWrapper]):
         for cursor in self:
             self._wrapper_index.get(cursor).include()
 
-    def _select_single_declaration(self, predicate: Predicate) -> DeclWrapper:
+    def _accepts(self, decl: DeclWrapper) -> bool:
+        """Whether a declaration from the underlying cursors passes every filter in this group"""
+        if isinstance(self._cursors, BaseDeclGroup) and not self._cursors._accepts(decl):
+            return False
+        return self._predicate is everything_predicate or self._predicate(decl)
+
+    def _named(self, kind: CursorKind, name: str) -> Iterable[DeclWrapper]:
+        """Declarations in this group of a particular kind with a particular spelling"""
+        root = self._cursors
+        while isinstance(root, BaseDeclGroup):
+            root = root._cursors
+        if isinstance(root, TranslationUnitIterable):
+            # Use the name index instead of scanning every declaration
+            return [d for d in root.declarations_named(kind, name) if self._accepts(d)]
+        return filter(functools.partial(_has_kind_and_spelling, kind, name), self)
+
+    def _select_named_declaration(self, kind: CursorKind, name: str) -> DeclWrapper:
+        """Query expected to return exactly one declaration with a particular name"""
+        return self._select_single_declaration(everything_predicate, self._named(kind, name))
+
+    def _select_single_declaration(
+            self,
+            predicate: Predicate,
+            candidates: Optional[Iterable[DeclWrapper]] = None,
+    ) -> DeclWrapper:
         """Query expected to return exactly one cursor"""
-        result = None
-        for index, decl in enumerate(filter(predicate, self)):
-            if index == 0:
-                result = decl
-            else:
-                raise RuntimeError("multiple matches")  # TODO: better error
+        if candidates is None:
+            candidates = self
+        matches = iter(candidates) if predicate is everything_predicate else filter(predicate, candidates)
+        result = next(matches, None)
         if result is None:
             raise RuntimeError("no matches")  # TODO: better error
-        return decl
+        # Look for just one more match, rather than exhausting the candidates
+        if next(matches, None) is not None:
+            raise RuntimeError("multiple matches")  # TODO: better error
+        return result
 
 
 class RootDeclGroup(BaseDeclGroup):
@@ -303,31 +573,27 @@ class RootDeclGroup(BaseDeclGroup):
         return BaseDeclGroup(
             self,
             self._wrapper_index,
-            lambda c: c.kind == CursorKind.ENUM_DECL and predicate(c),
+            _kind_predicate(CursorKind.ENUM_DECL, predicate),
         )
 
     def function(self, name: str) -> DeclWrapper:
-        return self.functions()._select_single_declaration(
-            lambda c: c.spelling == name
-        )
+        return self.functions()._select_named_declaration(CursorKind.FUNCTION_DECL, name)
 
     def functions(self, predicate: Predicate = everything_predicate) -> "BaseDeclGroup":
         return BaseDeclGroup(
             self,
             self._wrapper_index,
-            lambda c: c.kind == CursorKind.FUNCTION_DECL and predicate(c),
+            _kind_predicate(CursorKind.FUNCTION_DECL, predicate),
         )
 
     def macro(self, name: str) -> DeclWrapper:
-        return self.macros()._select_single_declaration(
-            lambda c: c.spelling == name
-        )
+        return self.macros()._select_named_declaration(CursorKind.MACRO_DEFINITION, name)
 
     def macros(self, predicate: Predicate = everything_predicate) -> "BaseDeclGroup":
         return BaseDeclGroup(
             self,
             self._wrapper_index,
-            lambda c: c.kind == CursorKind.MACRO_DEFINITION and predicate(c),
+            _kind_predicate(CursorKind.MACRO_DEFINITION, predicate),
         )
 
     def struct(self, name: str) -> DeclWrapper:
@@ -336,11 +602,8 @@ class RootDeclGroup(BaseDeclGroup):
         :param name: The name of the struct declaration
         :return: A struct declaration.
         """
-        return self.structs()._select_single_declaration(
-            lambda c:
-                c.spelling == name
-                and c.is_definition()
-        )
+        # structs() already restricts the selection to definitions
+        return self.structs()._select_named_declaration(CursorKind.STRUCT_DECL, name)
 
     def structs(self, predicate: Predicate = everything_predicate):
         """
@@ -351,11 +614,7 @@ class RootDeclGroup(BaseDeclGroup):
         return BaseDeclGroup(
             self,
             self._wrapper_index,
-            lambda c:
-                c.kind == CursorKind.STRUCT_DECL
-                and predicate(c)
-                and c.is_definition()
-            ,
+            _kind_predicate(CursorKind.STRUCT_DECL, predicate, definitions_only=True),
         )
 
     def typedef(self, name: str) -> TypedefWrapper:
@@ -364,7 +623,7 @@ class RootDeclGroup(BaseDeclGroup):
         :param name: The name of the TypeDef declaration
         :return: A TypeDef declaration.
         """
-        return self.typedefs()._select_single_declaration(lambda c: c.spelling == name)
+        return self.typedefs()._select_named_declaration(CursorKind.TYPEDEF_DECL, name)
 
     def typedefs(self, predicate: Predicate = everything_predicate) -> BaseDeclGroup:
         """
@@ -375,12 +634,12 @@ class RootDeclGroup(BaseDeclGroup):
         return BaseDeclGroup(
             self,
             self._wrapper_index,
-            lambda c: c.kind == CursorKind.TYPEDEF_DECL and predicate(c),
+            _kind_predicate(CursorKind.TYPEDEF_DECL, predicate),
         )
 
     def unions(self, predicate: Predicate = everything_predicate):
         return BaseDeclGroup(
             self,
             self._wrapper_index,
-            lambda c: c.kind == CursorKind.UNION_DECL and predicate(c),
+            _kind_predicate(CursorKind.UNION_DECL, predicate),
         )
@@ -1,53 +1,163 @@
-from clang.cindex import Index, TranslationUnit, TokenKind
+import hashlib
+import os
+from collections import defaultdict
+
+from typing import Optional
+
+from clang.cindex import (
+    Index,
+    Token,
+    TokenKind,
+    TranslationUnit,
+    TranslationUnitLoadError,
+    TranslationUnitSaveError,
+)
 
 from wrapid.decl import RootDeclGroup, TranslationUnitIterable, WrappedDeclIndex
 from wrapid.lib import clang_lib_loader  # noqa
 
 
 class ModuleBuilder(object):
-    def __init__(self, path, compiler_args=None, unsaved_files=None):
-        self.comment_index = dict()
-        self.translation_unit = Index.create().parse(
-            path=path,
-            args=compiler_args,
-            unsaved_files=unsaved_files,
-            options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
-            | TranslationUnit.PARSE_INCLUDE_BRIEF_COMMENTS_IN_CODE_COMPLETION,
-        )
+    def __init__(
+            self,
+            path,
+            compiler_args=None,
+            unsaved_files=None,
+            cache_dir=None,
+            index=None,
+            parse_options=None,
+    ):
+        """
+        :param path: The path to the C/C++ header file to wrap
+        :param compiler_args: Optional command line arguments for the clang parser
+        :param unsaved_files: Optional (path, contents) pairs overriding files on disk
+        :param cache_dir: Optional folder for reusing parsed translation units between runs.
+            Ignored when unsaved_files is given, because their contents are not part of the cache key.
+            When this is set, the path is parsed as an absolute path, and file names in
+            declaration locations, anonymous type names and warnings are absolute.
+        :param index: Optional clang.cindex.Index to share between several ModuleBuilders
+        :param parse_options: Optional clang.cindex.TranslationUnit.PARSE_* flags,
+            replacing default_parse_options
+        """
+        if index is None:
+            index = Index.create()
+        if parse_options is None:
+            parse_options = default_parse_options
+        if cache_dir is None or unsaved_files is not None:
+            self.translation_unit = _parse(index, path, compiler_args, parse_options, unsaved_files)
+        else:
+            self.translation_unit = _cached_parse(index, path, compiler_args, parse_options, cache_dir)
         self.wrapper_index = WrappedDeclIndex()
         # Store root cursor generator for later method delegation
         self.cursor_generator = RootDeclGroup(
             cursors=TranslationUnitIterable(self.translation_unit, self.wrapper_index),
             wrapper_index=self.wrapper_index,
         )
-        # Store the comments for later alignment to the cursors
-        ctu = self.comment_index.setdefault(self.translation_unit, dict())
-        # first pass - count all the tokens at each line, for later use by comment processing
-        token_start_counts = dict()
-        for token in self.translation_unit.cursor.get_tokens():
-            file_name = token.location.file.name
-            start_line = token.extent.start.line
-            token_start_counts.setdefault(file_name, dict()).setdefault(start_line, 0)
-            token_start_counts[file_name][start_line] += 1
-        # second pass - just look at the comments
+        # Comments are indexed on first use, because many scripts never need them
+        self._comment_starts: Optional[dict[tuple[str, int], list[Token]]] = None
+        self._comment_ends: Optional[dict[tuple[str, int], list[Token]]] = None
+
+    @property
+    def comment_ends(self) -> dict[tuple[str, int], list[Token]]:
+        """Comment tokens by (file name, end line), for comments alone on their first line"""
+        if self._comment_ends is None:
+            self._index_comments()
+        return self._comment_ends
+
+    @property
+    def comment_starts(self) -> dict[tuple[str, int], list[Token]]:
+        """Comment tokens by (file name, start line)"""
+        if self._comment_starts is None:
+            self._index_comments()
+        return self._comment_starts
+
+    def _index_comments(self) -> None:
+        """Store the comments for later alignment to the cursors"""
+        try:
+            self._comment_starts, self._comment_ends = self._comment_tables()
+        except AttributeError as error:
+            # Otherwise the properties above would fail over to __getattr__,
+            # which would hide this error behind a missing attribute on the cursor generator.
+            raise RuntimeError(f"failed to index comments: {error}") from error
+
+    def _comment_tables(self) -> tuple[dict[tuple[str, int], list[Token]], dict[tuple[str, int], list[Token]]]:
+        """:return: (comment_starts, comment_ends) tables"""
+        starts = defaultdict(list)
+        ends = defaultdict(list)
+        # Count all the tokens at each line, and collect the comments, in a single pass
+        token_start_counts = defaultdict(int)  # keyed by (file_name, start_line)
+        comments = []  # only the comment tokens, for the second loop below
+        comment_kind = TokenKind.COMMENT  # TokenKind instances are singletons, compared by identity
         for token in self.translation_unit.cursor.get_tokens():
-            if token.kind == TokenKind.COMMENT:
-                file_name = token.location.file.name
-                end_line = token.extent.end.line
-                starts = ctu.setdefault(file_name, dict()).setdefault("start_line", dict())
-                ends = ctu[file_name].setdefault("end_line", dict())
-                start_line = token.extent.start.line
-                starts.setdefault(start_line, list()).append(token)
-                # Only store ends for comments that are the only token on their start line
-                # (otherwise the comment probably does not belong to the declaration below it)
-                if token_start_counts[file_name][start_line] == 1:
-                    ends.setdefault(end_line, list()).append(token)
+            # A token's location is the start of its extent; reading the file and
+            # line from the same SourceLocation costs only one libclang lookup.
+            location = token.location
+            file_name = location.file.name
+            start_line = location.line
+            token_start_counts[file_name, start_line] += 1
+            if token.kind is comment_kind:
+                comments.append((file_name, start_line, token))
+        # Index the comments by line, now that all the line counts are known
+        for file_name, start_line, token in comments:
+            starts[file_name, start_line].append(token)
+            # Only store ends for comments that are the only token on their start line
+            # (otherwise the comment probably does not belong to the declaration below it)
+            if token_start_counts[file_name, start_line] == 1:
+                ends[file_name, token.extent.end.line].append(token)
+        return dict(starts), dict(ends)
 
     def __getattr__(self, method_name):
         """Delegate unknown methods to contained CursorGeneratorWrapper"""
         return getattr(self.cursor_generator, method_name)
 
 
+# Wrapping only needs declarations, so skip parsing the bodies of inline functions
+default_parse_options = (
+    TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+    | TranslationUnit.PARSE_INCLUDE_BRIEF_COMMENTS_IN_CODE_COMPLETION
+    | TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+)
+
+
+def _parse(index: Index, path, compiler_args, parse_options, unsaved_files=None) -> TranslationUnit:
+    return index.parse(
+        path=path,
+        args=compiler_args,
+        unsaved_files=unsaved_files,
+        options=parse_options,
+    )
+
+
+def _cached_parse(index: Index, path, compiler_args, parse_options, cache_dir) -> TranslationUnit:
+    """
+    Parse a source file, reusing a previously saved AST file if none of its sources have changed.
+
+    Each combination of path, arguments and options has a single AST file, which is overwritten
+    when it becomes stale. Failing to save the AST file does not prevent parsing.
+    """
+    path = os.path.abspath(path)
+    key = hashlib.sha1(repr((path, compiler_args, parse_options)).encode()).hexdigest()
+    ast_path = os.path.join(cache_dir, f"{key}.ast")
+    if os.path.isfile(ast_path):
+        try:
+            translation_unit = index.read(ast_path)
+        except TranslationUnitLoadError:
+            pass  # e.g. saved by a different version of libclang
+        else:
+            saved_time = os.path.getmtime(ast_path)
+            # The AST is stale if the file or any file it includes has been modified since it was saved
+            if os.path.getmtime(path) <= saved_time and all(
+                    i.include.time <= saved_time for i in translation_unit.get_includes()):
+                return translation_unit
+    translation_unit = _parse(index, path, compiler_args, parse_options)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        translation_unit.save(ast_path)
+    except (OSError, TranslationUnitSaveError):
+        pass  # the cache is only an optimization
+    return translation_unit
+
+
 __all__ = [
     "ModuleBuilder",
 ]